@@ -13,7 +13,7 @@ import json
 import sys
 import argparse
 from pathlib import Path
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Set, Tuple
 from urllib.parse import urlparse, unquote
 import csv
 import re
@@ -3324,39 +3324,61 @@ def find_most_recent_ai_csv(exclude_today: bool = True) -> Optional[Path]:
     return most_recent
 
 
+def _read_csv_urls(csv_path: Path) -> Set[str]:
+    """Return the non-empty, stripped values of the url column in csv_path."""
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if "url" not in header:
+            return set()
+        url_idx = header.index("url")
+        return {
+            url
+            for row in reader
+            if len(row) > url_idx and (url := row[url_idx].strip())
+        }
+
+
+def _read_csv_rows_excluding(csv_path: Path, excluded_urls: Set[str]) -> List[Dict]:
+    """
+    Return rows of csv_path whose url is non-empty and not in excluded_urls.
+    Rows are only turned into dicts once they pass the url check.
+    """
+    with open(csv_path, "r", encoding="utf-8", newline="") as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        if "url" not in header:
+            return []
+        url_idx = header.index("url")
+        kept = []
+        for row in reader:
+            if len(row) <= url_idx:
+                continue
+            url = row[url_idx].strip()
+            if url and url not in excluded_urls:
+                kept.append(dict(zip(header, row)))
+        return kept
+
+
 def find_new_jobs(current_csv: Path, previous_csv: Path) -> List[Dict]:
     """
     Compare two CSV files and return jobs from current_csv that don't exist in previous_csv.
     Jobs are compared by URL.
     """
     # Read previous CSV URLs
-    previous_urls = set()
     try:
-        with open(previous_csv, "r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                url = row.get("url", "").strip()
-                if url:
-                    previous_urls.add(url)
+        previous_urls = _read_csv_urls(previous_csv)
     except Exception as e:
         print(f"Error reading previous CSV {previous_csv}: {e}", file=sys.stderr)
         return []
 
     # Read current CSV and find new jobs
-    new_jobs = []
     try:
-        with open(current_csv, "r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                url = row.get("url", "").strip()
-                if url and url not in previous_urls:
-                    new_jobs.append(row)
+        return _read_csv_rows_excluding(current_csv, previous_urls)
     except Exception as e:
         print(f"Error reading current CSV {current_csv}: {e}", file=sys.stderr)
         return []
 
-    return new_jobs
-
 
 def find_removed_jobs(current_csv: Path, previous_csv: Path) -> List[Dict]:
     """
@@ -3364,33 +3386,19 @@ def find_removed_jobs(current_csv: Path, previous_csv: Path) -> List[Dict]:
     Jobs are compared by URL. This is the reverse of find_new_jobs().
     """
     # Read current CSV URLs
-    current_urls = set()
     try:
-        with open(current_csv, "r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                url = row.get("url", "").strip()
-                if url:
-                    current_urls.add(url)
+        current_urls = _read_csv_urls(current_csv)
     except Exception as e:
         print(f"Error reading current CSV {current_csv}: {e}", file=sys.stderr)
         return []
 
     # Read previous CSV and find removed jobs
-    removed_jobs = []
     try:
-        with open(previous_csv, "r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            for row in reader:
-                url = row.get("url", "").strip()
-                if url and url not in current_urls:
-                    removed_jobs.append(row)
+        return _read_csv_rows_excluding(previous_csv, current_urls)
     except Exception as e:
         print(f"Error reading previous CSV {previous_csv}: {e}", file=sys.stderr)
         return []
 
-    return removed_jobs
-
 
 def main():
     parser = argparse.ArgumentParser(
@@ -1,15 +1,23 @@
-import json
+import asyncio
+import csv
+import hashlib
+import io
 import logging
-import time
+import os
 from pathlib import Path
-from typing import Optional
+from typing import Dict, List, Optional, Set, Tuple
 from uuid import UUID, uuid4
 import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 
 sys.path.append(str(Path(__file__).parent.parent))
 
 from sqlalchemy import (
     create_engine,
+    select,
     text,
     Column,
     String,
@@ -18,12 +26,20 @@ from sqlalchemy import (
     Float,
     Text,
 )
-from sqlalchemy.dialects.postgresql import UUID as PGUUID
+from sqlalchemy.dialects.postgresql import UUID as PGUUID, insert as pg_insert
 from sqlalchemy.orm import declarative_base, sessionmaker
-from openai import OpenAI
+from openai import (
+    APIConnectionError,
+    APITimeoutError,
+    AsyncOpenAI,
+    BadRequestError,
+    InternalServerError,
+    RateLimitError,
+)
+from pgvector.sqlalchemy import HALFVEC, Vector
+from pydantic import ValidationError
 
 from models.ashby import AshbyApiResponse, AshbyJob
-from models.db import DatabaseJob
 
 # Configure logging
 logging.basicConfig(
@@ -31,7 +47,28 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+MAX_CONCURRENT_EMBEDDING_REQUESTS = 8
+MAX_EMBEDDING_RETRIES = 5
+UPSERT_BATCH_SIZE = 1000
+CACHE_LOOKUP_BATCH_SIZE = 5000
+EMBEDDING_MODEL = "text-embedding-3-small"
+EMBEDDING_DIMENSIONS = 1536
+# Requests are capped at 300k input tokens; stay well under it since counts are
+# estimated
+MAX_EMBEDDING_BATCH_TOKENS = 100_000
+# Each input is capped at 8191 tokens; cutting at 3 characters per token keeps typical
+# text under it without a tokenizer
+MAX_EMBEDDING_INPUT_CHARS = 8191 * 3
+# A round of companies is embedded and saved once it reaches either limit
+ROUND_MAX_COMPANIES = 50
+ROUND_MAX_TEXTS = 20_000
+# Files with more new jobs than this are loaded with COPY on a cold start
+COPY_THRESHOLD = 1024
+
 Base = declarative_base()
+# Tables with pgvector columns live on their own metadata so that scripts sharing Base
+# (fetch_job.py) don't need the vector extension or create tables only Ashby uses
+VectorBase = declarative_base()
 
 
 class CompanyTable(Base):
@@ -40,7 +77,7 @@ class CompanyTable(Base):
     name = Column(String, unique=True, nullable=False)
 
 
-class JobTable(Base):
+class JobTable(VectorBase):
     __tablename__ = "jobs"
     id = Column(PGUUID(as_uuid=True), primary_key=True)
     url = Column(String, nullable=False)
@@ -50,7 +87,7 @@ class JobTable(Base):
     description = Column(Text)
     employment_type = Column(String)
     industry = Column(String)
-    embedding = Column(Text)
+    embedding = Column(Vector(EMBEDDING_DIMENSIONS))
     posted_at = Column(DateTime)
     created_at = Column(DateTime, server_default=text("now()"))
     source = Column(String)
@@ -60,7 +97,7 @@ class JobTable(Base):
     wfh = Column(Boolean)
     application_url = Column(String)
     language = Column(String)
-    title_embedding = Column(Text)
+    title_embedding = Column(Vector(EMBEDDING_DIMENSIONS))
     verified_at = Column(DateTime)
     lon = Column(Float)
     lat = Column(Float)
@@ -73,6 +110,49 @@ class JobTable(Base):
     city = Column(String)
     ats_type = Column(String)
     company_id = Column(PGUUID(as_uuid=True))
+    description_hash = Column(String)
+
+
+class EmbeddingCacheTable(VectorBase):
+    __tablename__ = "embedding_cache"
+    hash = Column(String, primary_key=True)
+    model = Column(String, nullable=False)
+    vector = Column(HALFVEC(EMBEDDING_DIMENSIONS), nullable=False)
+
+
+def ensure_schema(engine) -> None:
+    """Bring tables created by older versions of this script up to date."""
+    with engine.begin() as conn:
+        # ALTER TABLE takes an ACCESS EXCLUSIVE lock on the shared jobs table before
+        # IF NOT EXISTS is checked, so only issue it when the column is really missing
+        has_description_hash = conn.execute(
+            text(
+                "SELECT 1 FROM information_schema.columns "
+                "WHERE table_name = 'jobs' AND column_name = 'description_hash'"
+            )
+        ).first()
+        if has_description_hash is None:
+            logger.info("Adding jobs.description_hash")
+            conn.execute(text("ALTER TABLE jobs ADD COLUMN description_hash TEXT"))
+
+        # The embedding cache is only used by this script and used to hold
+        # full-precision vectors (or text). The shared jobs columns are never altered
+        # here; see migrations/jobs_embeddings_halfvec.sql
+        cache_is_halfvec = conn.execute(
+            text(
+                "SELECT udt_name = 'halfvec' FROM information_schema.columns "
+                "WHERE table_name = 'embedding_cache' AND column_name = 'vector'"
+            )
+        ).scalar()
+        if cache_is_halfvec is False:
+            logger.info("Converting embedding_cache.vector to halfvec")
+            conn.execute(
+                text(
+                    "ALTER TABLE embedding_cache ALTER COLUMN vector "
+                    f"TYPE halfvec({EMBEDDING_DIMENSIONS}) "
+                    f"USING vector::text::halfvec({EMBEDDING_DIMENSIONS})"
+                )
+            )
 
 
 def get_or_create_company(session, company_name: str) -> UUID:
@@ -93,75 +173,373 @@ def get_or_create_company(session, company_name: str) -> UUID:
     return new_company.id
 
 
-def generate_embedding(
-    client: OpenAI, text: str, embedding_type: str = "general"
-) -> Optional[str]:
+def upsert_companies(session, company_names: Set[str]) -> Dict[str, UUID]:
+    """Create companies in one INSERT ... ON CONFLICT and return {name: id} for all."""
+    stmt = pg_insert(CompanyTable).values(
+        [{"id": uuid4(), "name": name} for name in company_names]
+    )
+    # The no-op update makes RETURNING include names that already existed
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["name"], set_={"name": stmt.excluded.name}
+    ).returning(CompanyTable.id, CompanyTable.name)
+    rows = session.execute(stmt).all()
+    session.commit()
+    return {name: company_id for company_id, name in rows}
+
+
+async def _create_embeddings_with_retry(
+    client: AsyncOpenAI,
+    inputs: List[str],
+    semaphore: asyncio.Semaphore,
+    embedding_type: str = "general",
+) -> List[np.ndarray]:
+    """
+    Request embeddings for one batch, retrying rate limits, connection errors,
+    timeouts and 5xx responses with backoff and honoring Retry-After.
+    """
+    for attempt in range(MAX_EMBEDDING_RETRIES + 1):
+        try:
+            async with semaphore:
+                response = await client.embeddings.create(
+                    input=inputs, model=EMBEDDING_MODEL
+                )
+            # Results come back in input order; float32 arrays bind to pgvector directly
+            return [
+                np.asarray(item.embedding, dtype=np.float32) for item in response.data
+            ]
+        except (
+            RateLimitError,
+            APIConnectionError,
+            APITimeoutError,
+            InternalServerError,
+        ) as e:
+            if attempt == MAX_EMBEDDING_RETRIES:
+                raise
+            # Connection errors and timeouts have no response to read Retry-After from
+            response = getattr(e, "response", None)
+            retry_after = (
+                response.headers.get("retry-after") if response is not None else None
+            )
+            try:
+                delay = float(retry_after)
+            except (TypeError, ValueError):
+                delay = 2**attempt
+            logger.warning(
+                f"{type(e).__name__} on {embedding_type} embeddings, retrying in "
+                f"{delay:.1f}s (attempt {attempt + 1}/{MAX_EMBEDDING_RETRIES})"
+            )
+            await asyncio.sleep(delay)
+
+
+def approx_token_count(text: str) -> int:
+    """Rough token estimate (~4 characters per token) used to size embedding batches."""
+    return len(text) // 4 + 1
+
+
+def truncate_for_embedding(text: str) -> str:
+    """Cut text that would exceed the model's per-input token limit."""
+    return text[:MAX_EMBEDDING_INPUT_CHARS]
+
+
+async def _embed_chunk(
+    client: AsyncOpenAI,
+    texts: List[str],
+    chunk: List[int],
+    semaphore: asyncio.Semaphore,
+    embedding_type: str,
+    rejected: Set[int],
+) -> List[Optional[np.ndarray]]:
+    """
+    Embed texts[i] for i in chunk. When the API rejects the request (e.g. an input
+    over the model's token limit), split it in half so only the offending text fails;
+    its index is added to rejected.
+    """
+    try:
+        return await _create_embeddings_with_retry(
+            client, [texts[i] for i in chunk], semaphore, embedding_type
+        )
+    except BadRequestError as e:
+        if len(chunk) == 1:
+            logger.error(
+                f"Rejected {embedding_type} embedding input "
+                f"(~{approx_token_count(texts[chunk[0]])} tokens): {e}"
+            )
+            rejected.add(chunk[0])
+            return [None]
+        logger.warning(
+            f"{embedding_type} embeddings batch of {len(chunk)} rejected, "
+            f"splitting: {e}"
+        )
+        middle = len(chunk) // 2
+        left, right = await asyncio.gather(
+            _embed_chunk(
+                client, texts, chunk[:middle], semaphore, embedding_type, rejected
+            ),
+            _embed_chunk(
+                client, texts, chunk[middle:], semaphore, embedding_type, rejected
+            ),
+        )
+        return left + right
+
+
+async def generate_embeddings_batch(
+    client: AsyncOpenAI,
+    texts: List[str],
+    semaphore: Optional[asyncio.Semaphore] = None,
+    batch_size: int = 256,
+    embedding_type: str = "general",
+    rejected: Optional[Set[int]] = None,
+) -> List[Optional[np.ndarray]]:
     """
-    Generate embedding using OpenAI API and wait for response.
+    Generate embeddings for many texts using concurrent batched OpenAI API calls.
 
     Args:
-        client: OpenAI client instance
-        text: Text to generate embedding for
+        client: AsyncOpenAI client instance
+        texts: Texts to generate embeddings for
+        semaphore: Shared limit on in-flight requests (created if not provided)
+        batch_size: Maximum number of texts sent per API request (requests are
+            also capped at roughly MAX_EMBEDDING_BATCH_TOKENS tokens)
         embedding_type: Type of embedding (for logging purposes)
+        rejected: Collects the indices of texts the API refused outright, which
+            fail the same way on every retry
 
     Returns:
-        String representation of embedding vector or None if failed
+        List aligned with ``texts`` holding each embedding as a float32 array,
+        or None for empty texts and failed batches
     """
-    if not text or not text.strip():
-        logger.warning(f"Empty text provided for {embedding_type} embedding")
-        return None
+    if semaphore is None:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_EMBEDDING_REQUESTS)
+    if rejected is None:
+        rejected = set()
+    texts = [truncate_for_embedding(text) for text in texts]
 
-    try:
+    embeddings: List[Optional[np.ndarray]] = [None] * len(texts)
+
+    # Empty texts are rejected by the API, so only send the non-empty ones
+    indices = [i for i, text in enumerate(texts) if text and text.strip()]
+    if len(indices) < len(texts):
         logger.debug(
-            f"Generating {embedding_type} embedding for text length: {len(text)}"
+            f"Skipping {len(texts) - len(indices)} empty texts for {embedding_type} embeddings"
+        )
+
+    # Close a batch when it reaches batch_size texts or its estimated token budget
+    chunks = []
+    chunk = []
+    chunk_tokens = 0
+    for i in indices:
+        tokens = approx_token_count(texts[i])
+        if chunk and (
+            len(chunk) == batch_size
+            or chunk_tokens + tokens > MAX_EMBEDDING_BATCH_TOKENS
+        ):
+            chunks.append(chunk)
+            chunk = []
+            chunk_tokens = 0
+        chunk.append(i)
+        chunk_tokens += tokens
+    if chunk:
+        chunks.append(chunk)
+
+    results = await asyncio.gather(
+        *(
+            _embed_chunk(client, texts, chunk, semaphore, embedding_type, rejected)
+            for chunk in chunks
+        ),
+        return_exceptions=True,
+    )
+
+    for chunk, result in zip(chunks, results):
+        if isinstance(result, BaseException):
+            logger.error(
+                f"Error generating {embedding_type} embeddings batch: {result}",
+                exc_info=result,
+            )
+            continue
+        for i, embedding in zip(chunk, result):
+            embeddings[i] = embedding
+
+    return embeddings
+
+
+async def embed_texts(
+    openai_api_key: str,
+    texts: List[str],
+    max_concurrent: int,
+    rejected: Optional[Set[int]] = None,
+) -> List[Optional[np.ndarray]]:
+    """Embed texts with up to max_concurrent batched requests in flight."""
+    semaphore = asyncio.Semaphore(max_concurrent)
+    # Retries are handled in _create_embeddings_with_retry
+    async with AsyncOpenAI(api_key=openai_api_key, max_retries=0) as client:
+        return await generate_embeddings_batch(
+            client, texts, semaphore=semaphore, rejected=rejected
         )
 
-        # Make synchronous API call and wait for response
-        response = client.embeddings.create(input=text, model="text-embedding-3-small")
 
-        # Extract embedding vector from response
-        embedding_values = response.data[0].embedding
+def embedding_hash(text: str) -> str:
+    """Content hash used to key the embedding cache and detect description changes."""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
 
-        logger.debug(
-            f"Successfully generated {embedding_type} embedding with {len(embedding_values)} dimensions"
+
+def load_cached_embeddings(session, hashes: List[str]) -> Dict[str, np.ndarray]:
+    """Return {hash: vector} for the given hashes found in the embedding cache."""
+    cached = {}
+    for start in range(0, len(hashes), CACHE_LOOKUP_BATCH_SIZE):
+        rows = (
+            session.query(EmbeddingCacheTable.hash, EmbeddingCacheTable.vector)
+            .filter(
+                EmbeddingCacheTable.model == EMBEDDING_MODEL,
+                EmbeddingCacheTable.hash.in_(
+                    hashes[start : start + CACHE_LOOKUP_BATCH_SIZE]
+                ),
+            )
+            .all()
+        )
+        # halfvec columns read back as HalfVector; use arrays like fresh embeddings
+        cached.update((text_hash, vector.to_numpy()) for text_hash, vector in rows)
+    return cached
+
+
+def store_cached_embeddings(session, vectors: Dict[str, np.ndarray]) -> None:
+    """Add freshly generated embeddings to the cache, ignoring hashes already stored."""
+    rows = [
+        {"hash": text_hash, "model": EMBEDDING_MODEL, "vector": vector}
+        for text_hash, vector in vectors.items()
+    ]
+    for start in range(0, len(rows), UPSERT_BATCH_SIZE):
+        stmt = pg_insert(EmbeddingCacheTable).values(
+            rows[start : start + UPSERT_BATCH_SIZE]
         )
+        session.execute(stmt.on_conflict_do_nothing(index_elements=["hash"]))
+    session.commit()
 
-        # Convert to string representation for PostgreSQL
-        return str(embedding_values)
 
-    except Exception as e:
-        logger.error(f"Error generating {embedding_type} embedding: {e}", exc_info=True)
-        return None
+def resolve_embeddings(
+    session, openai_api_key: str, pending_companies: List[dict], max_concurrent: int
+) -> Set[str]:
+    """
+    Fill in desc_embeds/title_embeds for every queued text of every pending company.
 
+    Texts are deduplicated by content hash across companies and looked up in the
+    embedding cache first; only cache misses are sent to OpenAI.
 
-def convert_ashby_to_database_job(
-    ashby_job: AshbyJob,
-    company_name: str,
-    company_id: UUID,
-    description_embedding: Optional[str],
-    title_embedding: Optional[str],
-) -> DatabaseJob:
-    """Convert AshbyJob to DatabaseJob."""
-    logger.debug(f"Converting AshbyJob to DatabaseJob: {ashby_job.title}")
-    return DatabaseJob(
-        id=UUID(ashby_job.id),
-        url=ashby_job.job_url,
-        title=ashby_job.title,
-        location=ashby_job.location,
-        company=company_name,
-        description=ashby_job.description_plain,
-        employment_type=ashby_job.employment_type,
-        remote=ashby_job.is_remote,
-        application_url=ashby_job.apply_url,
-        posted_at=ashby_job.published_at,
-        source="ashby",
-        ats_type="ashby",
-        company_id=company_id,
-        embedding=description_embedding,
-        title_embedding=title_embedding,
-        is_active=ashby_job.is_listed,
+    Returns the hashes of texts the API rejected outright, so callers can tell them
+    apart from failures that may succeed on a later run.
+    """
+    texts_by_hash = {}
+    for pending in pending_companies:
+        for text in pending["desc_texts"] + pending["title_loc_texts"]:
+            if text and text.strip():
+                texts_by_hash.setdefault(embedding_hash(text), text)
+
+    vectors = load_cached_embeddings(session, list(texts_by_hash))
+    missing = [text_hash for text_hash in texts_by_hash if text_hash not in vectors]
+    logger.info(
+        f"Embedding cache: {len(vectors)} hits, {len(missing)} texts to embed "
+        f"(max {max_concurrent} concurrent requests)"
     )
 
+    rejected = set()
+    if missing:
+        embeddings = asyncio.run(
+            embed_texts(
+                openai_api_key,
+                [texts_by_hash[text_hash] for text_hash in missing],
+                max_concurrent,
+                rejected,
+            )
+        )
+        fresh = {
+            text_hash: embedding
+            for text_hash, embedding in zip(missing, embeddings)
+            if embedding is not None
+        }
+        store_cached_embeddings(session, fresh)
+        vectors.update(fresh)
+
+    for pending in pending_companies:
+        for texts_key, embeds_key in (
+            ("desc_texts", "desc_embeds"),
+            ("title_loc_texts", "title_embeds"),
+        ):
+            embeds = pending[embeds_key]
+            for i, text in enumerate(pending[texts_key]):
+                if text and text.strip():
+                    embeds[i] = vectors.get(embedding_hash(text))
+
+    return {missing[i] for i in rejected}
+
+
+def upsert_jobs(session, rows: List[dict]) -> None:
+    """Insert or update jobs in bulk with INSERT ... ON CONFLICT (id) DO UPDATE."""
+    if not rows:
+        return
+
+    # Only overwrite the columns we were given, so omitted ones keep their stored
+    # values. Rows may omit different columns (e.g. reused embeddings), and one
+    # multi-row INSERT needs the same columns in every row, so rows are grouped by
+    # their columns
+    rows_by_columns = {}
+    for row in rows:
+        rows_by_columns.setdefault(tuple(row), []).append(row)
+
+    for columns, column_rows in rows_by_columns.items():
+        update_columns = [name for name in columns if name != "id"]
+        for start in range(0, len(column_rows), UPSERT_BATCH_SIZE):
+            stmt = pg_insert(JobTable).values(
+                column_rows[start : start + UPSERT_BATCH_SIZE]
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["id"],
+                set_={name: stmt.excluded[name] for name in update_columns},
+            )
+            session.execute(stmt)
+    logger.debug(f"Upserted {len(rows)} jobs")
+
+
+def _copy_value(value):
+    """Format a value for COPY, writing vectors in pgvector's '[x,y,...]' text form."""
+    if isinstance(value, np.ndarray):
+        return "[" + ",".join(map(str, value.tolist())) + "]"
+    return value
+
+
+def copy_jobs(session, rows: List[dict]) -> None:
+    """Bulk-load jobs with COPY FROM STDIN. The rows must not exist in the table yet."""
+    if not rows:
+        return
+
+    columns = list(rows[0])
+    buffer = io.StringIO()
+    # Unquoted empty fields are NULL in COPY's CSV format; quoted ones are empty strings
+    writer = csv.writer(buffer, quoting=csv.QUOTE_NOTNULL)
+    writer.writerows([_copy_value(row[column]) for column in columns] for row in rows)
+    buffer.seek(0)
+
+    # Run on the session's connection so the COPY is part of the current transaction
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {JobTable.__tablename__} ({', '.join(columns)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+    logger.debug(f"Copied {len(rows)} jobs")
+
+
+def company_name_from_file(json_file: Path) -> str:
+    """Derive the company name from a JSON filename, capitalizing the first letter."""
+    company_name = json_file.stem.replace("-", " ").replace("_", " ")
+    return company_name[0].upper() + company_name[1:] if company_name else company_name
+
+
+def parse_company_file(json_file: Path) -> List[AshbyJob]:
+    """Load and validate one company JSON file. Runs in a worker process."""
+    # Validate straight from bytes so pydantic-core parses the JSON itself
+    return AshbyApiResponse.model_validate_json(json_file.read_bytes()).jobs
+
 
 def load_processed_companies(checkpoint_file: Path) -> set:
     """Load list of already processed companies from checkpoint file."""
@@ -183,16 +561,28 @@ def mark_company_processed(checkpoint_file: Path, company_name: str):
     logger.debug(f"Marked {company_name} as processed in checkpoint file")
 
 
-def check_job_exists_by_url(
-    session, url: str, ats_type: str, company_name: str
-) -> Optional[JobTable]:
-    """Check if job exists in DB by URL, ats_type, and company_name."""
-    existing = (
-        session.query(JobTable)
-        .filter_by(url=url, ats_type=ats_type, company=company_name)
-        .first()
-    )
-    return existing
+def load_existing_jobs_by_url(session, ats_type: str, company_name: str) -> dict:
+    """
+    Load the stored jobs for one company in a single query, keyed by URL.
+
+    Only the columns needed to decide whether embeddings can be reused are selected;
+    the vectors themselves are reduced to has_embedding/has_title_embedding flags.
+    """
+    rows = session.execute(
+        select(
+            JobTable.url,
+            JobTable.embedding.isnot(None).label("has_embedding"),
+            JobTable.title_embedding.isnot(None).label("has_title_embedding"),
+            JobTable.title,
+            JobTable.location,
+            JobTable.description_hash,
+            JobTable.description,
+        ).where(JobTable.ats_type == ats_type, JobTable.company == company_name)
+    ).all()
+    existing_by_url = {}
+    for row in rows:
+        existing_by_url.setdefault(row.url, row)
+    return existing_by_url
 
 
 def deactivate_removed_jobs(
@@ -227,8 +617,170 @@ def deactivate_removed_jobs(
         logger.debug(f"  No jobs to deactivate for {company_name}")
 
 
+def embed_and_save_round(
+    session,
+    openai_api_key: str,
+    pending_companies: List[dict],
+    max_concurrent: int,
+    cold_start: bool,
+    checkpoint_file: Path,
+) -> Tuple[int, int, int]:
+    """
+    Embed the queued texts of one round of companies, save their jobs and checkpoint
+    each company that was fully saved.
+
+    Returns (jobs saved, companies processed, errors).
+    """
+    jobs_processed = 0
+    companies_processed = 0
+    errors = 0
+
+    logger.info(f"\n{'=' * 60}")
+    logger.info(f"Generating embeddings for {len(pending_companies)} companies...")
+    rejected_hashes = resolve_embeddings(
+        session, openai_api_key, pending_companies, max_concurrent
+    )
+    logger.info("Embedding generation complete")
+
+    # Write jobs to the database once this round's embeddings have resolved
+    for pending in pending_companies:
+        company_name = pending["company_name"]
+        company_id = pending["company_id"]
+        jobs = pending["jobs"]
+        jobs_count = len(jobs)
+        try:
+            logger.info(f"\n{'=' * 60}")
+            logger.info(f"Saving {jobs_count} jobs for {company_name}")
+
+            # Track URLs for diff logic
+            current_job_urls = {ashby_job.job_url for ashby_job in jobs}
+
+            # Rows keyed by job ID so a duplicated job can't appear twice in one upsert.
+            # They only hold the columns Ashby provides, so values other tools fill in
+            # (industry, salary, geocoding, ...) are kept on update
+            rows_by_id = {}
+            for idx, ashby_job in enumerate(jobs):
+                try:
+                    job_id = UUID(ashby_job.id)
+                except ValueError as e:
+                    logger.error(f"    ✗ Error processing job '{ashby_job.title}': {e}")
+                    errors += 1
+                    continue
+
+                row = {
+                    "id": job_id,
+                    "url": ashby_job.job_url,
+                    "title": ashby_job.title,
+                    "location": ashby_job.location,
+                    "company": company_name,
+                    "description": ashby_job.description_plain,
+                    "employment_type": ashby_job.employment_type,
+                    "posted_at": ashby_job.published_at,
+                    "source": "ashby",
+                    "is_active": ashby_job.is_listed,
+                    "remote": ashby_job.is_remote,
+                    "application_url": ashby_job.apply_url,
+                    "added_by_user": False,
+                    "ats_type": "ashby",
+                    "company_id": company_id,
+                    "description_hash": pending["description_hashes"][idx],
+                }
+
+                # Reused embeddings are left out so the stored vectors stay untouched
+                if not pending["desc_reused"][idx]:
+                    embedding = pending["desc_embeds"][idx]
+                    if embedding is None:
+                        logger.warning(
+                            f"    ⚠ No description embedding for {ashby_job.title}"
+                        )
+                    row["embedding"] = embedding
+                if not pending["title_reused"][idx]:
+                    title_embedding = pending["title_embeds"][idx]
+                    if title_embedding is None:
+                        logger.warning(
+                            f"    ⚠ No title embedding for {ashby_job.title}"
+                        )
+                    row["title_embedding"] = title_embedding
+
+                rows_by_id[job_id] = row
+
+            # Insert new jobs and update existing ones (including is_active) in bulk
+            rows = list(rows_by_id.values())
+            try:
+                if cold_start and len(rows) > COPY_THRESHOLD:
+                    copy_jobs(session, rows)
+                    action = "Copied"
+                else:
+                    upsert_jobs(session, rows)
+                    action = "Upserted"
+                session.commit()
+                jobs_processed += len(rows)
+                logger.info(f"✓ {action} {len(rows)} jobs for {company_name}")
+            except Exception as e:
+                logger.error(
+                    f"✗ Error saving jobs for {company_name}: {e}", exc_info=True
+                )
+                session.rollback()
+                errors += 1
+                continue
+
+            # After processing all jobs, check for removed listings and deactivate them
+            try:
+                logger.info(f"Checking for removed listings for {company_name}...")
+                deactivate_removed_jobs(
+                    session, company_id, "ashby", current_job_urls, company_name
+                )
+            except Exception as e:
+                logger.error(
+                    f"Error deactivating removed jobs for {company_name}: {e}",
+                    exc_info=True,
+                )
+                session.rollback()
+
+            companies_processed += 1
+
+            # Texts whose embedding request failed were saved with NULL vectors; leave
+            # the company out of the checkpoint so the next run embeds them again.
+            # Texts the API rejected outright would fail again, so they don't count
+            missing_embeddings = sum(
+                1
+                for texts_key, embeds_key in (
+                    ("desc_texts", "desc_embeds"),
+                    ("title_loc_texts", "title_embeds"),
+                )
+                for text, embedding in zip(pending[texts_key], pending[embeds_key])
+                if text
+                and text.strip()
+                and embedding is None
+                and embedding_hash(text) not in rejected_hashes
+            )
+            if missing_embeddings:
+                logger.warning(
+                    f"⚠ {missing_embeddings} embeddings missing for {company_name}, "
+                    "not marking it as processed"
+                )
+                continue
+
+            # Mark company as successfully processed
+            mark_company_processed(checkpoint_file, company_name)
+            logger.info(f"✓ Completed processing {company_name}")
+
+        except Exception as e:
+            logger.error(
+                f"Error processing {pending['json_file'].name}: {e}", exc_info=True
+            )
+            session.rollback()
+            errors += 1
+
+    return jobs_processed, companies_processed, errors
+
+
 def process_ashby_companies(
-    database_url: str, openai_api_key: str, companies_folder: str = None
+    database_url: str,
+    openai_api_key: str,
+    companies_folder: str = None,
+    max_concurrent: int = MAX_CONCURRENT_EMBEDDING_REQUESTS,
+    truncate: bool = False,
 ):
     """
     Process Ashby company JSON files and save to database.
@@ -237,6 +789,8 @@ def process_ashby_companies(
         database_url: PostgreSQL connection string
         openai_api_key: OpenAI API key
         companies_folder: Path to the folder containing company JSON files
+        max_concurrent: Maximum number of embedding requests in flight
+        truncate: Delete existing Ashby jobs and reload every company from scratch
     """
     # Default to companies folder relative to this script
     if companies_folder is None:
@@ -258,15 +812,33 @@ def process_ashby_companies(
     # Initialize database connection
     logger.info("Initializing database connection...")
     engine = create_engine(database_url)
+    with engine.begin() as conn:
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector"))
     Base.metadata.create_all(engine)
+    VectorBase.metadata.create_all(engine)
+    ensure_schema(engine)
     Session = sessionmaker(bind=engine)
     session = Session()
     logger.info("Database connection established")
 
-    # Initialize OpenAI client
-    logger.info("Initializing OpenAI client...")
-    openai_client = OpenAI(api_key=openai_api_key)
-    logger.info("OpenAI client initialized")
+    if truncate:
+        logger.info(
+            "Truncate mode: deleting existing Ashby jobs and resetting checkpoint"
+        )
+        deleted = (
+            session.query(JobTable)
+            .filter_by(ats_type="ashby")
+            .delete(synchronize_session=False)
+        )
+        session.commit()
+        checkpoint_file.unlink(missing_ok=True)
+        processed_companies = set()
+        logger.info(f"Deleted {deleted} Ashby jobs")
+
+    # With no Ashby jobs stored yet, every job is new and large files can use COPY
+    cold_start = session.query(JobTable.id).filter_by(ats_type="ashby").first() is None
+    if cold_start:
+        logger.info("No Ashby jobs in DB, using COPY for large company files")
 
     companies_path = Path(companies_folder)
 
@@ -275,7 +847,15 @@ def process_ashby_companies(
         return
 
     logger.info(f"Scanning for JSON files in: {companies_path}")
-    json_files = list(companies_path.glob("*.json"))
+    # One scandir pass returns names and file types without a stat per entry
+    with os.scandir(companies_path) as entries:
+        json_files = [
+            Path(entry.path)
+            for entry in entries
+            if entry.name.endswith(".json")
+            and not entry.name.startswith(".")
+            and entry.is_file()
+        ]
     logger.info(f"Found {len(json_files)} JSON files to process")
 
     total_jobs_processed = 0
@@ -283,199 +863,178 @@ def process_ashby_companies(
     total_companies_skipped = 0
     total_errors = 0
 
-    # Iterate through all JSON files
+    # Companies whose jobs are waiting for embeddings, in file order, and how many
+    # texts they queued
+    pending_companies = []
+    pending_texts = 0
+
+    def flush_round():
+        nonlocal pending_companies, pending_texts
+        nonlocal total_jobs_processed, total_companies_processed, total_errors
+        jobs_saved, companies_saved, round_errors = embed_and_save_round(
+            session,
+            openai_api_key,
+            pending_companies,
+            max_concurrent,
+            cold_start,
+            checkpoint_file,
+        )
+        total_jobs_processed += jobs_saved
+        total_companies_processed += companies_saved
+        total_errors += round_errors
+        pending_companies = []
+        pending_texts = 0
+
+    # Skip companies already processed before spending time parsing their files
+    files_to_process = []
     for json_file in json_files:
+        company_name = company_name_from_file(json_file)
+        if company_name in processed_companies:
+            logger.info(f"⏭  Skipping {company_name} (already processed)")
+            total_companies_skipped += 1
+            continue
+        files_to_process.append((json_file, company_name))
+
+    # Load all known companies once, then create the missing ones in one statement
+    company_cache = {
+        name: company_id
+        for company_id, name in session.execute(
+            select(CompanyTable.id, CompanyTable.name)
+        ).all()
+    }
+    logger.info(f"Loaded {len(company_cache)} existing companies")
+    new_company_names = {
+        company_name.strip() for _, company_name in files_to_process
+    } - company_cache.keys()
+    if new_company_names:
+        company_cache.update(upsert_companies(session, new_company_names))
+        logger.info(f"Created {len(new_company_names)} new companies")
+
+    # Parse and validate files on all cores; results are consumed in file order so
+    # DB lookups for one company overlap with parsing of the next ones. Only a few
+    # files are parsed ahead so parsed jobs don't pile up in memory
+    workers = os.cpu_count() or 1
+    parse_ahead = 2 * workers
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        parse_futures = deque(
+            executor.submit(parse_company_file, json_file)
+            for json_file, _ in files_to_process[:parse_ahead]
+        )
         try:
-            logger.info(f"\n{'=' * 60}")
-            logger.info(f"Processing file: {json_file.name}")
-
-            # Extract company name from filename and capitalize first letter
-            company_name = json_file.stem.replace("-", " ").replace("_", " ")
-            company_name = (
-                company_name[0].upper() + company_name[1:]
-                if company_name
-                else company_name
-            )
-
-            logger.info(f"Company name: {company_name}")
+            # Iterate through all JSON files
+            for idx, (json_file, company_name) in enumerate(files_to_process):
+                parse_future = parse_futures.popleft()
+                if idx + parse_ahead < len(files_to_process):
+                    next_file, _ = files_to_process[idx + parse_ahead]
+                    parse_futures.append(executor.submit(parse_company_file, next_file))
 
-            # Skip if already processed
-            if company_name in processed_companies:
-                logger.info(f"⏭  Skipping {company_name} (already processed)")
-                total_companies_skipped += 1
-                continue
-
-            # Get or create company
-            company_id = get_or_create_company(session, company_name)
-
-            # Load JSON file
-            logger.debug(f"Loading JSON file: {json_file}")
-            with open(json_file, "r", encoding="utf-8") as f:
-                company_data = json.load(f)
-            logger.debug(f"Loaded JSON file successfully")
-
-            # Parse using Pydantic model
-            logger.debug("Parsing JSON with Pydantic model...")
-            ashby_response = AshbyApiResponse(**company_data)
-            logger.debug("Parsed successfully")
+                try:
+                    logger.info(f"\n{'=' * 60}")
+                    logger.info(f"Processing file: {json_file.name}")
+                    logger.info(f"Company name: {company_name}")
 
-            jobs_count = len(ashby_response.jobs)
-            logger.info(f"Found {jobs_count} jobs for {company_name}")
+                    company_id = company_cache[company_name.strip()]
 
-            # Track URLs for diff logic
-            current_job_urls = set()
+                    # Wait for the worker to load and parse the JSON file
+                    jobs = parse_future.result()
+                    logger.debug("Parsed successfully")
 
-            # Process each job
-            for idx, ashby_job in enumerate(ashby_response.jobs, 1):
-                try:
-                    logger.info(f"  [{idx}/{jobs_count}] Processing: {ashby_job.title}")
+                    jobs_count = len(jobs)
+                    logger.info(f"Found {jobs_count} jobs for {company_name}")
 
-                    # Check if job URL already exists in DB
-                    existing_job_by_url = check_job_exists_by_url(
-                        session, ashby_job.job_url, "ashby", company_name
+                    existing_by_url = (
+                        {}
+                        if cold_start
+                        else load_existing_jobs_by_url(session, "ashby", company_name)
                     )
 
-                    # Generate embeddings only if job doesn't exist or needs update
-                    description_embedding = None
-                    title_embedding = None
-
-                    if existing_job_by_url:
-                        # Job exists - keep existing embeddings, skip generation
-                        logger.info(
-                            f"    Job URL already exists in DB, skipping embedding generation"
-                        )
-                        description_embedding = existing_job_by_url.embedding
-                        title_embedding = existing_job_by_url.title_embedding
-                    else:
-                        # Generate description embedding (first API call - wait for response)
-                        if (
-                            ashby_job.description_plain
-                            and ashby_job.description_plain.strip()
-                        ):
-                            logger.info(f"    Generating description embedding...")
-                            description_embedding = generate_embedding(
-                                openai_client,
-                                ashby_job.description_plain,
-                                embedding_type="description",
-                            )
-                            if description_embedding:
-                                logger.info(f"    ✓ Description embedding complete")
-                            else:
-                                logger.warning(
-                                    f"    ⚠ Failed to generate description embedding"
-                                )
-                        else:
-                            logger.warning(
-                                f"    ⚠ No description available for embedding"
+                    # Keep stored embeddings when the text they were built from is
+                    # unchanged, queue the rest (an empty text means nothing to embed)
+                    description_hashes = []
+                    desc_texts = []
+                    title_loc_texts = []
+                    desc_reused = []
+                    title_reused = []
+                    for ashby_job in jobs:
+                        description = ashby_job.description_plain or ""
+                        description_hash = embedding_hash(description)
+                        description_hashes.append(description_hash)
+
+                        existing = existing_by_url.get(ashby_job.job_url)
+                        # Rows stored before description_hash existed fall back to
+                        # comparing text
+                        description_unchanged = (
+                            existing is not None
+                            and existing.has_embedding
+                            and (
+                                existing.description_hash == description_hash
+                                if existing.description_hash
+                                else existing.description == ashby_job.description_plain
                             )
-
-                        # Generate title+location embedding (second API call - wait for response)
-                        title_location_text = f"{ashby_job.title}; {ashby_job.location}"
-                        logger.info(f"    Generating title embedding...")
-                        title_embedding = generate_embedding(
-                            openai_client, title_location_text, embedding_type="title"
                         )
-                        if title_embedding:
-                            logger.info(f"    ✓ Title embedding complete")
-                        else:
-                            logger.warning(f"    ⚠ Failed to generate title embedding")
-
-                    # Add URL to tracking set for diff logic
-                    current_job_urls.add(ashby_job.job_url)
-
-                    # Convert to DatabaseJob (with embeddings)
-                    logger.debug("Converting to DatabaseJob...")
-                    db_job = convert_ashby_to_database_job(
-                        ashby_job,
-                        company_name,
-                        company_id,
-                        description_embedding,
-                        title_embedding,
-                    )
-
-                    # Verify embeddings are present before saving
-                    embeddings_status = []
-                    if db_job.embedding:
-                        embeddings_status.append("description✓")
-                    else:
-                        embeddings_status.append("description✗")
-
-                    if db_job.title_embedding:
-                        embeddings_status.append("title✓")
-                    else:
-                        embeddings_status.append("title✗")
-
-                    logger.debug(f"    Embeddings: {' '.join(embeddings_status)}")
+                        title_unchanged = (
+                            existing is not None
+                            and existing.has_title_embedding
+                            and existing.title == ashby_job.title
+                            and existing.location == ashby_job.location
+                        )
 
-                    # Insert into database
-                    job_dict = db_job.model_dump(exclude_none=False)
-                    logger.debug(f"Job dict created with {len(job_dict)} fields")
+                        desc_reused.append(description_unchanged)
+                        desc_texts.append("" if description_unchanged else description)
+                        title_reused.append(title_unchanged)
+                        title_loc_texts.append(
+                            ""
+                            if title_unchanged
+                            else f"{ashby_job.title}; {ashby_job.location}"
+                        )
 
-                    # Check if job already exists by ID
-                    logger.debug(f"Checking if job exists: {job_dict['id']}")
-                    existing = (
-                        session.query(JobTable).filter_by(id=job_dict["id"]).first()
+                    queued_count = sum(1 for t in desc_texts + title_loc_texts if t)
+                    logger.info(f"Queued {queued_count} texts for embedding")
+
+                    pending_companies.append(
+                        {
+                            "json_file": json_file,
+                            "company_name": company_name,
+                            "company_id": company_id,
+                            "jobs": jobs,
+                            "description_hashes": description_hashes,
+                            "desc_texts": desc_texts,
+                            "title_loc_texts": title_loc_texts,
+                            "desc_reused": desc_reused,
+                            "title_reused": title_reused,
+                            "desc_embeds": [None] * jobs_count,
+                            "title_embeds": [None] * jobs_count,
+                        }
                     )
-                    if existing:
-                        # Update existing job (including setting is_active=True if it was inactive)
-                        logger.debug("Job exists, updating...")
-                        for key, value in job_dict.items():
-                            setattr(existing, key, value)
-                        # Ensure job is marked as active since it's in current scrape
-                        existing.is_active = db_job.is_active
-                        logger.info(f"    ✓ Updated existing job: {ashby_job.title}")
-                    else:
-                        # Insert new job
-                        logger.debug("Job is new, inserting...")
-                        new_job = JobTable(**job_dict)
-                        session.add(new_job)
-                        logger.info(f"    ✓ Inserted new job: {ashby_job.title}")
-
-                    session.commit()
-                    logger.debug("Changes committed to database")
-                    total_jobs_processed += 1
-
-                    # Wait 3 seconds before processing next job to avoid rate limits (only if generating embeddings)
-                    if not existing_job_by_url and idx < jobs_count:
-                        logger.debug("Waiting 3 seconds before next job...")
-                        time.sleep(3)
+                    pending_texts += queued_count
 
+                except ValidationError as e:
+                    logger.error(
+                        f"Invalid JSON in {json_file.name}: {e}", exc_info=True
+                    )
+                    session.rollback()
+                    total_errors += 1
                 except Exception as e:
                     logger.error(
-                        f"    ✗ Error processing job '{ashby_job.title}': {e}",
-                        exc_info=True,
+                        f"Error processing {json_file.name}: {e}", exc_info=True
                     )
                     session.rollback()
                     total_errors += 1
-                    continue
 
-            # After processing all jobs, check for removed listings and deactivate them
-            try:
-                logger.info(f"Checking for removed listings for {company_name}...")
-                deactivate_removed_jobs(
-                    session, company_id, "ashby", current_job_urls, company_name
-                )
-            except Exception as e:
-                logger.error(
-                    f"Error deactivating removed jobs for {company_name}: {e}",
-                    exc_info=True,
-                )
-                session.rollback()
-
-            total_companies_processed += 1
-
-            # Mark company as successfully processed
-            mark_company_processed(checkpoint_file, company_name)
-            logger.info(f"✓ Completed processing {company_name}")
-
-        except json.JSONDecodeError as e:
-            logger.error(f"JSON decode error in {json_file.name}: {e}", exc_info=True)
-            session.rollback()
-            total_errors += 1
-        except Exception as e:
-            logger.error(f"Error processing {json_file.name}: {e}", exc_info=True)
-            session.rollback()
-            total_errors += 1
+                # Embed, save and checkpoint in bounded rounds so memory stays flat
+                # and an interrupted run keeps the companies already finished
+                if (
+                    len(pending_companies) >= ROUND_MAX_COMPANIES
+                    or pending_texts >= ROUND_MAX_TEXTS
+                ):
+                    flush_round()
+        finally:
+            # If the loop exits early, don't leave queued files to be parsed on exit
+            for parse_future in parse_futures:
+                parse_future.cancel()
+
+    if pending_companies:
+        flush_round()
 
     session.close()
     logger.info(f"\n{'=' * 60}")
@@ -514,6 +1073,18 @@ if __name__ == "__main__":
         default=None,
         help="Path to companies folder (default: ./companies relative to script)",
     )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=MAX_CONCURRENT_EMBEDDING_REQUESTS,
+        help=f"Maximum concurrent embedding requests (default: {MAX_CONCURRENT_EMBEDDING_REQUESTS})",
+    )
+
+    parser.add_argument(
+        "--truncate",
+        action="store_true",
+        help="Delete existing Ashby jobs and reload all companies (ignores checkpoint)",
+    )
 
     args = parser.parse_args()
 
@@ -530,4 +1101,6 @@ if __name__ == "__main__":
         database_url=args.database_url,
         openai_api_key=args.openai_api_key,
         companies_folder=args.companies_folder,
+        max_concurrent=args.max_concurrent,
+        truncate=args.truncate,
     )
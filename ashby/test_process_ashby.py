@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import asyncio
+import csv
+import io
+from types import SimpleNamespace
+
+import numpy as np
+from openai import BadRequestError
+from pgvector import HalfVector
+from sqlalchemy.dialects import postgresql
+
+from ashby import process_ashby
+from ashby.process_ashby import (
+    MAX_EMBEDDING_BATCH_TOKENS,
+    MAX_EMBEDDING_INPUT_CHARS,
+    _copy_value,
+    approx_token_count,
+    copy_jobs,
+    embedding_hash,
+    generate_embeddings_batch,
+    load_cached_embeddings,
+    resolve_embeddings,
+    upsert_jobs,
+)
+
+
+class RecordingCursor:
+    def __init__(self):
+        self.sql = None
+        self.data = None
+
+    def copy_expert(self, sql, buffer):
+        self.sql = sql
+        self.data = buffer.read()
+
+    def close(self):
+        pass
+
+
+def make_session(cursor: RecordingCursor):
+    """Just enough of a session for session.connection().connection.cursor()."""
+    raw_connection = SimpleNamespace(cursor=lambda: cursor)
+    return SimpleNamespace(
+        connection=lambda: SimpleNamespace(connection=raw_connection)
+    )
+
+
+def test_copy_value_formats_arrays():
+    assert _copy_value(np.array([0.5, -1.25], dtype=np.float16)) == "[0.5,-1.25]"
+    assert _copy_value(np.array([0.5, -1.25], dtype=np.float32)) == "[0.5,-1.25]"
+    assert _copy_value("text") == "text"
+    assert _copy_value(None) is None
+
+
+def make_cache_session(rows):
+    """Just enough of a session for session.query(...).filter(...).all()."""
+    query = SimpleNamespace(filter=lambda *criteria: SimpleNamespace(all=lambda: rows))
+    return SimpleNamespace(query=lambda *columns: query)
+
+
+def test_copy_jobs_writes_vectors_from_cache_and_api_as_pgvector_text():
+    # The halfvec cache column reads back as HalfVector and is loaded as an array
+    cached = load_cached_embeddings(
+        make_cache_session([("h", HalfVector([1.0, 2.0]))]), ["h"]
+    )
+    assert cached["h"].dtype == np.float16
+
+    cursor = RecordingCursor()
+    rows = [
+        {
+            "id": "a",
+            "title": 'Engineer, "Platform"',
+            "embedding": cached["h"],
+            "title_embedding": np.array([0.5, 0.25], dtype=np.float32),
+            "location": None,
+        }
+    ]
+
+    copy_jobs(make_session(cursor), rows)
+
+    assert cursor.sql.startswith(
+        "COPY jobs (id, title, embedding, title_embedding, location) FROM STDIN"
+    )
+    (record,) = csv.reader(io.StringIO(cursor.data))
+    assert record == ["a", 'Engineer, "Platform"', "[1.0,2.0]", "[0.5,0.25]", ""]
+    # NULL is written as an unquoted empty field
+    assert cursor.data.rstrip("\r\n").endswith(",")
+
+
+class FakeEmbeddings:
+    """Rejects any request containing a "bad" input, like an over-long description."""
+
+    def __init__(self):
+        self.requests = []
+
+    async def create(self, input, model):
+        self.requests.append(list(input))
+        if any(text.startswith("bad") for text in input):
+            # Skip __init__, which wants a real HTTP response; only the type matters
+            error = BadRequestError.__new__(BadRequestError)
+            Exception.__init__(error, "input too long")
+            raise error
+        data = [SimpleNamespace(embedding=[float(len(text))]) for text in input]
+        return SimpleNamespace(data=data)
+
+
+def test_rejected_batch_is_split_so_only_the_bad_text_fails():
+    embeddings = FakeEmbeddings()
+    client = SimpleNamespace(embeddings=embeddings)
+    texts = ["a", "bb", "bad", "", "dddd"]
+    rejected = set()
+
+    result = asyncio.run(generate_embeddings_batch(client, texts, rejected=rejected))
+
+    assert [None if e is None else e.tolist() for e in result] == [
+        [1.0],
+        [2.0],
+        None,
+        None,
+        [4.0],
+    ]
+    assert embeddings.requests[0] == ["a", "bb", "bad", "dddd"]
+    # Only the text the API refused is reported as rejected, not the empty one
+    assert rejected == {2}
+
+
+def test_texts_over_the_input_limit_are_truncated_before_sending():
+    embeddings = FakeEmbeddings()
+    client = SimpleNamespace(embeddings=embeddings)
+
+    asyncio.run(
+        generate_embeddings_batch(client, ["y" * (MAX_EMBEDDING_INPUT_CHARS + 10)])
+    )
+
+    assert [len(text) for text in embeddings.requests[0]] == [MAX_EMBEDDING_INPUT_CHARS]
+
+
+def test_batches_are_capped_by_estimated_tokens():
+    embeddings = FakeEmbeddings()
+    client = SimpleNamespace(embeddings=embeddings)
+    long_text = "x" * (MAX_EMBEDDING_BATCH_TOKENS * 2)  # about half the budget
+    texts = [long_text] * 5
+
+    asyncio.run(generate_embeddings_batch(client, texts))
+
+    for request in embeddings.requests:
+        assert sum(approx_token_count(text) for text in request) <= (
+            MAX_EMBEDDING_BATCH_TOKENS
+        )
+    assert sum(len(request) for request in embeddings.requests) == 5
+
+
+def test_upsert_leaves_out_embedding_columns_of_reused_rows():
+    statements = []
+    session = SimpleNamespace(execute=statements.append)
+    rows = [
+        {"id": "00000000-0000-0000-0000-000000000001", "title": "Reused"},
+        {
+            "id": "00000000-0000-0000-0000-000000000002",
+            "title": "Changed",
+            "embedding": np.zeros(3, dtype=np.float32),
+        },
+    ]
+
+    upsert_jobs(session, rows)
+
+    updates = [
+        str(stmt.compile(dialect=postgresql.dialect())).split("DO UPDATE SET ")[1]
+        for stmt in statements
+    ]
+    assert updates == [
+        "title = excluded.title",
+        "title = excluded.title, embedding = excluded.embedding",
+    ]
+
+
+def test_resolve_embeddings_dedups_texts_and_only_embeds_cache_misses(monkeypatch):
+    cached_vector = np.array([9.0], dtype=np.float16)
+    sent = []
+    stored = {}
+
+    async def fake_embed_texts(openai_api_key, texts, max_concurrent, rejected=None):
+        sent.extend(texts)
+        return [np.array([float(len(text))], dtype=np.float32) for text in texts]
+
+    monkeypatch.setattr(
+        process_ashby,
+        "load_cached_embeddings",
+        lambda session, hashes: {
+            h: cached_vector for h in hashes if h == embedding_hash("cached")
+        },
+    )
+    monkeypatch.setattr(
+        process_ashby,
+        "store_cached_embeddings",
+        lambda session, vectors: stored.update(vectors),
+    )
+    monkeypatch.setattr(process_ashby, "embed_texts", fake_embed_texts)
+    pending_companies = [
+        {
+            "desc_texts": ["shared", "cached", ""],
+            "title_loc_texts": ["new", "", ""],
+            "desc_embeds": [None] * 3,
+            "title_embeds": [None] * 3,
+        },
+        {
+            "desc_texts": ["shared"],
+            "title_loc_texts": ["cached"],
+            "desc_embeds": [None],
+            "title_embeds": [None],
+        },
+    ]
+
+    rejected = resolve_embeddings(None, "key", pending_companies, 1)
+
+    # Each distinct uncached text is sent once, even when several companies share it
+    assert sorted(sent) == ["new", "shared"]
+    assert set(stored) == {embedding_hash("new"), embedding_hash("shared")}
+    assert rejected == set()
+    first, second = pending_companies
+    assert [e is None for e in first["desc_embeds"]] == [False, False, True]
+    assert first["desc_embeds"][0].tolist() == [6.0]
+    assert first["desc_embeds"][1] is cached_vector
+    assert first["title_embeds"][0].tolist() == [3.0]
+    assert second["desc_embeds"][0].tolist() == [6.0]
+    assert second["title_embeds"][0] is cached_vector
@@ -162,10 +162,7 @@ def extract_description_from_ashby(
 ) -> Optional[str]:
     """Extract job description from Ashby JSON file."""
     try:
-        with open(json_file, "r", encoding="utf-8") as f:
-            data = json.load(f)
-
-        parsed = AshbyApiResponse(**data)
+        parsed = AshbyApiResponse.model_validate_json(json_file.read_bytes())
 
         for job in parsed.jobs:
             job_url = job.job_url or job.apply_url or ""
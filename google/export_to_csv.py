@@ -1,43 +1,114 @@
 from __future__ import annotations
 
-import json
+import hashlib
+import os
+import pickle
 import sys
 from pathlib import Path
 from typing import Iterable, List
 
+import orjson
+
 ROOT_DIR = Path(__file__).resolve().parent.parent
 if str(ROOT_DIR) not in sys.path:
     sys.path.insert(0, str(ROOT_DIR))
 
 from export_utils import generate_job_id, write_jobs_csv  # noqa: E402
+from google import parser as google_parser  # noqa: E402
 from google.parser import parse_jobs  # noqa: E402
 
 GOOGLE_DIR = Path(__file__).resolve().parent
 DATA_DIR = GOOGLE_DIR / "data"
 JOBS_CSV_PATH = GOOGLE_DIR / "jobs.csv"
 FALLBACK_RAW_FILES = [GOOGLE_DIR / "list_ds1_raw.txt"]
+PAYLOAD_SUFFIXES = (".json", ".txt")
+CACHE_DIR = GOOGLE_DIR / ".cache"
+# Bump to drop every cached entry when the cache layout changes
+CACHE_VERSION = 1
+# Cached jobs are only reused when produced by the same parser source
+PARSER_DIGEST = hashlib.sha1(Path(google_parser.__file__).read_bytes()).hexdigest()
 
 
 def _payload_files() -> List[Path]:
     paths: List[Path] = []
     if DATA_DIR.exists():
-        for pattern in ("*.json", "*.txt"):
-            for file_path in sorted(DATA_DIR.glob(pattern)):
-                if file_path.is_file():
-                    paths.append(file_path)
+        with os.scandir(DATA_DIR) as entries:
+            paths = [
+                Path(entry.path)
+                for entry in entries
+                if entry.name.endswith(PAYLOAD_SUFFIXES)
+                and not entry.name.startswith(".")
+                and entry.is_file()
+            ]
+        # .json payloads first, then .txt, each sorted by path
+        paths.sort(key=lambda path: (PAYLOAD_SUFFIXES.index(path.suffix), path))
     for fallback in FALLBACK_RAW_FILES:
         if fallback.exists() and fallback.is_file() and fallback not in paths:
             paths.append(fallback)
     return paths
 
 
+def _cache_path(path: Path) -> Path:
+    digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()
+    return CACHE_DIR / f"{digest}.pickle"
+
+
+def _cache_key(stat: os.stat_result) -> tuple:
+    return (CACHE_VERSION, PARSER_DIGEST, stat.st_mtime_ns, stat.st_size)
+
+
+def _load_cached_jobs(path: Path, stat: os.stat_result) -> List[dict[str, str]] | None:
+    try:
+        with open(_cache_path(path), "rb") as f:
+            key, jobs = pickle.load(f)
+    except (
+        OSError,
+        EOFError,
+        ValueError,
+        TypeError,
+        AttributeError,
+        ImportError,
+        pickle.UnpicklingError,
+    ):
+        return None
+    if key != _cache_key(stat):
+        return None
+    return jobs
+
+
+def _store_cached_jobs(
+    path: Path, stat: os.stat_result, jobs: List[dict[str, str]]
+) -> None:
+    cache_path = _cache_path(path)
+    tmp_path = cache_path.with_suffix(".tmp")
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            pickle.dump(
+                (_cache_key(stat), jobs),
+                f,
+                protocol=pickle.HIGHEST_PROTOCOL,
+            )
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        print(f"Could not cache {path.name}: {exc}")
+
+
 def _load_jobs_from_path(path: Path) -> List[dict[str, str]]:
+    # Reuse the parsed jobs from the last run while the file (mtime and size) and the
+    # parser are unchanged
+    stat = path.stat()
+    jobs = _load_cached_jobs(path, stat)
+    if jobs is not None:
+        return jobs
+
     try:
-        payload = json.loads(path.read_text())
-    except json.JSONDecodeError as exc:
+        payload = orjson.loads(path.read_bytes())
+    except orjson.JSONDecodeError as exc:
         print(f"Skipping {path.name}: {exc}")
         return []
     jobs = parse_jobs(payload)
+    _store_cached_jobs(path, stat, jobs)
     return jobs
 
 
@@ -65,20 +136,19 @@ def main(paths: Iterable[Path] | None = None) -> None:
         print("No Google ds:1 payload files found. Run google/main.py to fetch data first.")
         return
 
-    job_rows: List[dict[str, str]] = []
-    seen = set()
+    # Keyed by (ats_id, url); dict membership de-duplicates and keeps first-seen order
+    rows_by_key: dict[tuple[str, str], dict[str, str]] = {}
 
     for raw_file in raw_files:
         jobs = _load_jobs_from_path(raw_file)
         print(f"Loaded {len(jobs)} jobs from {raw_file.relative_to(GOOGLE_DIR)}")
         for job in jobs:
             key = _unique_key(job)
-            if not any(key):
-                continue
-            if key in seen:
+            if not any(key) or key in rows_by_key:
                 continue
-            seen.add(key)
-            job_rows.append(_job_to_row(job))
+            rows_by_key[key] = _job_to_row(job)
+
+    job_rows = list(rows_by_key.values())
 
     print(f"Aggregated {len(job_rows)} unique jobs")
     diff_path = write_jobs_csv(JOBS_CSV_PATH, job_rows)
@@ -2,12 +2,16 @@ from __future__ import annotations
 
 import argparse
 import asyncio
-import json
 import sys
 from pathlib import Path
-from typing import Any, Iterable, List
+from typing import Any, Iterable, List, Sequence
 
-from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeoutError
+import orjson
+from playwright.async_api import (
+    Error as PlaywrightError,
+    TimeoutError as PlaywrightTimeoutError,
+    async_playwright,
+)
 
 ROOT_DIR = Path(__file__).resolve().parent.parent
 if str(ROOT_DIR) not in sys.path:
@@ -20,6 +24,9 @@ GOOGLE_DIR = Path(__file__).resolve().parent
 DEFAULT_URL = "https://careers.google.com/jobs/results/"
 DEFAULT_RAW_PATH = GOOGLE_DIR / "data" / "ds1_listings.json"
 DEFAULT_CSV_PATH = GOOGLE_DIR / "jobs.csv"
+DEFAULT_MAX_CONCURRENT = 4
+CHUNK_POLL_INTERVAL = 0.05  # seconds
+BLOCKED_ASSET_GLOB = "**/*.{png,jpg,jpeg,gif,svg,webp,ico,woff,woff2,ttf,css}"
 NEXT_BUTTON_SELECTORS = [
     "button[aria-label='Next page']",
     "div[role='button'][aria-label='Next page']",
@@ -98,7 +105,7 @@ def _rel_path(path: Path) -> Path:
         return path
 
 
-async def _wait_for_ds_chunk(page, chunk_key: str, timeout_ms: int) -> Any:
+async def _wait_for_ds_chunk(cdp, chunk_key: str, timeout_ms: int) -> Any:
     js = """
     (chunkKey) => {
         const store = globalThis.__dsChunkStore || [];
@@ -128,9 +135,29 @@ async def _wait_for_ds_chunk(page, chunk_key: str, timeout_ms: int) -> Any:
         return null;
     }
     """
-    handle = await page.wait_for_function(js, arg=chunk_key, timeout=timeout_ms)
-    chunk = await handle.json_value()
-    if not chunk or "data" not in chunk:
+    # Poll with a raw CDP Runtime.evaluate instead of page.wait_for_function, which
+    # goes through Playwright's RPC layer on a coarser default polling interval
+    expression = f"({js})({orjson.dumps(chunk_key).decode()})"
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout_ms / 1000
+    while True:
+        try:
+            response = await cdp.send(
+                "Runtime.evaluate", {"expression": expression, "returnByValue": True}
+            )
+            chunk = response.get("result", {}).get("value")
+        except PlaywrightError:
+            # The execution context is replaced while the page navigates
+            chunk = None
+        if chunk:
+            break
+        if loop.time() >= deadline:
+            raise PlaywrightTimeoutError(
+                f"Timeout {timeout_ms}ms exceeded waiting for chunk {chunk_key}"
+            )
+        await asyncio.sleep(CHUNK_POLL_INTERVAL)
+
+    if "data" not in chunk:
         raise RuntimeError(f"Chunk {chunk_key} did not include data")
     return chunk["data"]
 
@@ -152,27 +179,24 @@ async def _click_next_page(page) -> bool:
     return False
 
 
-async def fetch_ds1_payloads(
+async def _fetch_one(
+    context,
     url: str,
     chunk_key: str,
-    timeout: float,
-    headless: bool,
-    max_pages: int | None = None,
+    timeout_ms: int,
+    max_pages: int | None,
+    semaphore: asyncio.Semaphore,
 ) -> List[Any]:
-    timeout_ms = int(timeout * 1000)
     payloads: List[Any] = []
-    async with async_playwright() as p:
-        browser = await p.chromium.launch(headless=headless)
-        context = await browser.new_context(user_agent=(
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129 Safari/537.36"
-        ))
+    async with semaphore:
         page = await context.new_page()
-        await page.add_init_script(CHUNK_CAPTURE_INIT)
+        cdp = await context.new_cdp_session(page)
         try:
-            await page.goto(url, wait_until="networkidle", timeout=timeout_ms)
+            # _wait_for_ds_chunk does the real synchronization, so there is no need to
+            # wait for Google's analytics beacons to go quiet
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout_ms)
             while True:
-                data = await _wait_for_ds_chunk(page, chunk_key, timeout_ms)
+                data = await _wait_for_ds_chunk(cdp, chunk_key, timeout_ms)
                 payloads.append(data)
 
                 if max_pages and len(payloads) >= max_pages:
@@ -181,9 +205,57 @@ async def fetch_ds1_payloads(
                 has_next = await _click_next_page(page)
                 if not has_next:
                     break
+        finally:
+            try:
+                await cdp.detach()
+            except PlaywrightError:
+                # The session is already gone if the page crashed or the target closed;
+                # don't let that mask the original error or skip closing the page
+                pass
+            await page.close()
+    return payloads
+
+
+async def fetch_ds1_payloads(
+    urls: Sequence[str],
+    chunk_key: str,
+    timeout: float,
+    headless: bool,
+    max_pages: int | None = None,
+    max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+) -> List[Any]:
+    # One browser and context for all URLs; each URL gets its own page. Payloads
+    # come back in URL order, then page order. A URL that fails is reported and
+    # skipped so the payloads fetched for the others are kept.
+    timeout_ms = int(timeout * 1000)
+    semaphore = asyncio.Semaphore(max_concurrent)
+    async with async_playwright() as p:
+        browser = await p.chromium.launch(headless=headless)
+        context = await browser.new_context(user_agent=(
+            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+            "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/129 Safari/537.36"
+        ))
+        await context.add_init_script(CHUNK_CAPTURE_INIT)
+        # Only the inline ds chunks are needed; skip images, fonts and stylesheets
+        await context.route(BLOCKED_ASSET_GLOB, lambda route: route.abort())
+        try:
+            results = await asyncio.gather(
+                *[
+                    _fetch_one(context, url, chunk_key, timeout_ms, max_pages, semaphore)
+                    for url in urls
+                ],
+                return_exceptions=True,
+            )
         finally:
             await context.close()
             await browser.close()
+
+    payloads: List[Any] = []
+    for url, result in zip(urls, results):
+        if isinstance(result, BaseException):
+            print(f"Failed to fetch {url}: {result}")
+            continue
+        payloads.extend(result)
     return payloads
 
 
@@ -206,7 +278,13 @@ def build_csv_rows(jobs: Iterable[dict[str, str]]) -> List[dict[str, str]]:
 
 def parse_args() -> argparse.Namespace:
     parser = argparse.ArgumentParser(description="Fetch Google Careers listings via Playwright")
-    parser.add_argument("--url", default=DEFAULT_URL, help="Jobs results URL to load")
+    parser.add_argument(
+        "--url",
+        action="append",
+        dest="urls",
+        default=None,
+        help=f"Jobs results URL to load; repeat to fetch several (default: {DEFAULT_URL})",
+    )
     parser.add_argument("--chunk", default="ds:1", help="AF_initData chunk key to read")
     parser.add_argument("--timeout", type=float, default=25.0, help="Timeout in seconds")
     parser.add_argument(
@@ -230,7 +308,13 @@ def parse_args() -> argparse.Namespace:
         "--max-pages",
         type=int,
         default=0,
-        help="Maximum number of pages to visit (0 = no limit)",
+        help="Maximum number of pages to visit per URL (0 = no limit)",
+    )
+    parser.add_argument(
+        "--max-concurrent",
+        type=int,
+        default=DEFAULT_MAX_CONCURRENT,
+        help="Maximum number of URLs fetched at once in the shared browser",
     )
     return parser.parse_args()
 
@@ -240,16 +324,17 @@ async def run(args: argparse.Namespace) -> None:
     raw_path.parent.mkdir(parents=True, exist_ok=True)
 
     if args.from_file:
-        ds1_payloads = [json.loads(Path(args.from_file).read_text())]
+        ds1_payloads = [orjson.loads(Path(args.from_file).read_bytes())]
     else:
         max_pages = args.max_pages if args.max_pages > 0 else None
         try:
             ds1_payloads = await fetch_ds1_payloads(
-                args.url,
+                args.urls or [DEFAULT_URL],
                 args.chunk,
                 args.timeout,
                 headless=not args.headed,
                 max_pages=max_pages,
+                max_concurrent=args.max_concurrent,
             )
         except PlaywrightTimeoutError as exc:
             raise SystemExit(f"Timed out waiting for ds chunk: {exc}") from exc
@@ -258,12 +343,12 @@ async def run(args: argparse.Namespace) -> None:
             raise SystemExit("No ds:1 payloads fetched")
 
         if len(ds1_payloads) == 1:
-            raw_path.write_text(json.dumps(ds1_payloads[0], indent=2))
+            raw_path.write_bytes(orjson.dumps(ds1_payloads[0], option=orjson.OPT_INDENT_2))
             print(f"Saved raw ds:1 payload to {_rel_path(raw_path)}")
         else:
             for idx, payload in enumerate(ds1_payloads, start=1):
                 page_path = raw_path.with_name(f"{raw_path.stem}_page{idx}{raw_path.suffix}")
-                page_path.write_text(json.dumps(payload, indent=2))
+                page_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
                 print(f"Saved page {idx} raw payload to {_rel_path(page_path)}")
 
     jobs: List[dict[str, str]] = []
@@ -1,14 +1,15 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 from typing import Any, Iterable, List, Sequence
 
+import orjson
+
 
 def load_ds1_payload(path: str | Path) -> List[Any]:
     """Load the cached ds:1 payload produced by the Google careers listing page."""
     file_path = Path(path)
-    raw = json.loads(file_path.read_text())
+    raw = orjson.loads(file_path.read_bytes())
     if isinstance(raw, dict) and "data" in raw:
         raw = raw["data"]
     if not isinstance(raw, list):
@@ -54,26 +55,26 @@ def _extract_location_name(raw_location: Any) -> str | None:
 def _format_locations(raw_locations: Any) -> str:
     if not isinstance(raw_locations, list):
         return ""
-    ordered_unique: List[str] = []
+    # dict keys keep insertion order and give O(1) membership checks
+    seen: dict[str, None] = {}
     for raw in raw_locations:
         name = _extract_location_name(raw)
-        if name and name not in ordered_unique:
-            ordered_unique.append(name)
-    return ", ".join(ordered_unique)
+        if name:
+            seen.setdefault(name, None)
+    return ", ".join(seen)
 
 
 def normalize_job_entry(entry: Sequence[Any]) -> dict[str, str] | None:
     if not isinstance(entry, Sequence) or not entry:
         return None
 
-    def get(idx: int) -> Any:
-        return entry[idx] if idx < len(entry) else None
-
-    ats_id = _coerce_str(get(0))
-    title = _coerce_str(get(1))
-    url = _coerce_str(get(2))
-    company = _coerce_str(get(7)) or "Google"
-    locations = _format_locations(get(9))
+    cs = _coerce_str
+    size = len(entry)
+    ats_id = cs(entry[0])
+    title = cs(entry[1]) if size > 1 else ""
+    url = cs(entry[2]) if size > 2 else ""
+    company = (cs(entry[7]) if size > 7 else "") or "Google"
+    locations = _format_locations(entry[9]) if size > 9 else ""
 
     if not ats_id and not url:
         return None
@@ -88,12 +89,24 @@ def normalize_job_entry(entry: Sequence[Any]) -> dict[str, str] | None:
 
 
 def parse_jobs(ds1_payload: Any) -> List[dict[str, str]]:
-    jobs: List[dict[str, str]] = []
-    for entry in extract_job_entries(ds1_payload):
-        normalized = normalize_job_entry(entry)
-        if normalized:
-            jobs.append(normalized)
-    return jobs
+    return [
+        normalized
+        for entry in extract_job_entries(ds1_payload)
+        if (normalized := normalize_job_entry(entry)) is not None
+    ]
+
+
+def index_jobs_by_ats_id(jobs: Iterable[dict[str, str]]) -> dict[str, dict[str, str]]:
+    """
+    Map ats_id -> job for O(1) lookups; jobs without an ats_id are left out.
+    For duplicate ids the first job wins, matching find_job_by_ats_id.
+    """
+    index: dict[str, dict[str, str]] = {}
+    for job in jobs:
+        ats_id = job.get("ats_id")
+        if ats_id:
+            index.setdefault(ats_id, job)
+    return index
 
 
 def find_job_by_ats_id(jobs: Iterable[dict[str, str]], ats_id: str) -> dict[str, str] | None:
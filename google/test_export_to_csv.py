@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+
+import orjson
+import pytest
+
+from google import export_to_csv
+
+
+@pytest.fixture
+def payload_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(export_to_csv, "CACHE_DIR", tmp_path / ".cache")
+    path = tmp_path / "page.json"
+    path.write_bytes(orjson.dumps({"jobs": []}))
+    return path
+
+
+@pytest.fixture
+def parse_calls(monkeypatch):
+    calls = []
+
+    def fake_parse_jobs(payload):
+        calls.append(payload)
+        return [{"ats_id": str(len(calls)), "url": "https://example.com"}]
+
+    monkeypatch.setattr(export_to_csv, "parse_jobs", fake_parse_jobs)
+    return calls
+
+
+def test_unchanged_file_is_served_from_cache(payload_file, parse_calls):
+    first = export_to_csv._load_jobs_from_path(payload_file)
+    second = export_to_csv._load_jobs_from_path(payload_file)
+
+    assert len(parse_calls) == 1
+    assert second == first
+
+
+def test_modified_file_is_parsed_again(payload_file, parse_calls):
+    export_to_csv._load_jobs_from_path(payload_file)
+    stat = payload_file.stat()
+    os.utime(payload_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    export_to_csv._load_jobs_from_path(payload_file)
+
+    # Same mtime, different size
+    payload_file.write_bytes(orjson.dumps({"jobs": [1]}))
+    os.utime(payload_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    jobs = export_to_csv._load_jobs_from_path(payload_file)
+
+    assert len(parse_calls) == 3
+    assert jobs[0]["ats_id"] == "3"
+
+
+def test_parser_change_invalidates_cache(payload_file, parse_calls, monkeypatch):
+    export_to_csv._load_jobs_from_path(payload_file)
+    monkeypatch.setattr(export_to_csv, "PARSER_DIGEST", "changed")
+    export_to_csv._load_jobs_from_path(payload_file)
+
+    assert len(parse_calls) == 2
+
+
+def test_corrupt_cache_entry_is_a_miss(payload_file, parse_calls):
+    export_to_csv._load_jobs_from_path(payload_file)
+    export_to_csv._cache_path(payload_file).write_bytes(b"not a pickle")
+
+    jobs = export_to_csv._load_jobs_from_path(payload_file)
+
+    assert len(parse_calls) == 2
+    assert jobs[0]["ats_id"] == "2"
@@ -1,16 +1,17 @@
 from __future__ import annotations
 
-import json
 from pathlib import Path
 
-from google.parser import find_job_by_ats_id, parse_jobs
+import orjson
+
+from google.parser import find_job_by_ats_id, index_jobs_by_ats_id, parse_jobs
 
 
 SAMPLE_PATH = Path(__file__).resolve().parents[1] / "google" / "list_ds1_raw.txt"
 
 
 def load_sample_jobs():
-    data = json.loads(SAMPLE_PATH.read_text())
+    data = orjson.loads(SAMPLE_PATH.read_bytes())
     return parse_jobs(data)
 
 
@@ -33,3 +34,28 @@ def test_find_single_job_by_ats_id():
     assert "Technical Program Manager" in job["title"]
     assert "Thornton, CO, USA" in job["location"]
     assert "Reston, VA, USA" in job["location"]
+
+
+def test_index_jobs_by_ats_id_matches_linear_lookup():
+    jobs = load_sample_jobs()
+
+    index = index_jobs_by_ats_id(jobs)
+    assert index["101243395980042950"] == find_job_by_ats_id(jobs, "101243395980042950")
+    assert "missing" not in index
+
+
+def test_index_jobs_by_ats_id_keeps_first_duplicate_and_skips_missing_ids():
+    jobs = [
+        {"ats_id": "1", "title": "First"},
+        {"ats_id": "", "title": "Empty id"},
+        {"title": "No id"},
+        {"ats_id": "1", "title": "Duplicate"},
+        {"ats_id": "2", "title": "Second"},
+    ]
+
+    index = index_jobs_by_ats_id(jobs)
+
+    assert set(index) == {"1", "2"}
+    assert index["1"] is find_job_by_ats_id(jobs, "1")
+    assert index["1"]["title"] == "First"
+    assert index["2"]["title"] == "Second"
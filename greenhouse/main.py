@@ -5,9 +5,9 @@ import csv
 import json
 import os
 import random
+import re
 import time
 from datetime import datetime
-from urllib.parse import urlparse
 
 import aiohttp
 
@@ -16,13 +16,13 @@ BASE_RETRY_DELAY = 2  # seconds
 MIN_SCRAPE_DELAY = 1  # seconds
 MAX_SCRAPE_DELAY = 3  # seconds
 
+_SLUG_RE = re.compile(r"^https?://(?:job-)?boards\.greenhouse\.io/([^/?#]+)")
 
-def extract_company_slug(url: str) -> str:
+
+def extract_company_slug(url: str) -> str | None:
     """Extract company slug from Greenhouse job board URL"""
-    parsed = urlparse(url)
-    # Extract the path and remove leading slash
-    path = parsed.path.lstrip("/")
-    return path
+    match = _SLUG_RE.match(url.strip())
+    return match.group(1) if match else None
 
 
 def load_company_data(file_path: str) -> dict | None:
@@ -205,14 +205,12 @@ async def scrape_all_greenhouse_jobs(force: bool = False):
     skipped_companies = 0
 
     # Build a mapping from slug to company name
-    slug_to_name = {}
     with open(csv_path, "r") as f:
-        reader = csv.DictReader(f)
-        for row in reader:
-            company_url = row["url"]
-            company_name = row["name"]
-            company_slug = extract_company_slug(company_url)
-            slug_to_name[company_slug] = company_name
+        slug_to_name = {
+            company_slug: row["name"]
+            for row in csv.DictReader(f)
+            if (company_slug := extract_company_slug(row["url"]))
+        }
 
     companies = list(slug_to_name.keys())
     print(f"Processing {len(companies)} companies...")
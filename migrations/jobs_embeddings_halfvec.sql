@@ -0,0 +1,25 @@
+-- Convert jobs.embedding and jobs.title_embedding from vector(1536) to halfvec(1536).
+--
+-- Not run by any scraper. The jobs table is shared by every ATS source, so apply this
+-- by hand in a maintenance window once every reader and writer is ready for halfvec:
+--   * ALTER COLUMN ... TYPE rewrites the whole table under an ACCESS EXCLUSIVE lock.
+--   * Values are rounded to fp16 for every source; this cannot be undone.
+--   * Indexes built with vector_*_ops make the ALTER fail. Drop them first and recreate
+--     them with the matching halfvec_*_ops afterwards (see the commented example).
+--   * Queries that compare against ::vector must switch to ::halfvec.
+--
+-- psql "$DATABASE_URL" -v ON_ERROR_STOP=1 -f migrations/jobs_embeddings_halfvec.sql
+
+BEGIN;
+
+-- DROP INDEX IF EXISTS jobs_embedding_idx;
+-- DROP INDEX IF EXISTS jobs_title_embedding_idx;
+
+ALTER TABLE jobs
+    ALTER COLUMN embedding TYPE halfvec(1536) USING embedding::halfvec(1536),
+    ALTER COLUMN title_embedding TYPE halfvec(1536) USING title_embedding::halfvec(1536);
+
+-- CREATE INDEX jobs_embedding_idx ON jobs USING hnsw (embedding halfvec_cosine_ops);
+-- CREATE INDEX jobs_title_embedding_idx ON jobs USING hnsw (title_embedding halfvec_cosine_ops);
+
+COMMIT;
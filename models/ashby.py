@@ -1,15 +1,19 @@
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
 from typing import List, Optional, Dict, Any, Union
 from datetime import datetime
 
 
 class Address(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     postal_address: Optional[Dict[str, str]] = Field(
         alias="postalAddress", default=None
     )
 
 
 class CompensationComponent(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     id: Optional[str] = None
     summary: Optional[str] = None
     compensation_type: str = Field(alias="compensationType")
@@ -20,6 +24,8 @@ class CompensationComponent(BaseModel):
 
 
 class CompensationTier(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     id: str
     tier_summary: str = Field(alias="tierSummary")
     title: Optional[str] = None
@@ -30,6 +36,8 @@ class CompensationTier(BaseModel):
 
 
 class Compensation(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     compensation_tier_summary: Optional[str] = Field(
         alias="compensationTierSummary", default=None
     )
@@ -45,6 +53,8 @@ class Compensation(BaseModel):
 
 
 class AshbyJob(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     id: str
     title: str
     department: str
@@ -84,13 +94,17 @@ class AshbyJob(BaseModel):
 
 
 class AshbyApiResponse(BaseModel):
+    model_config = ConfigDict(extra="ignore")
+
     jobs: List[AshbyJob]
     api_version: str = Field(alias="apiVersion")
 
 
 # Example usage:
 # response_data = {...}  # Your JSON data
-# ashby_response = AshbyApiResponse(**response_data)
+# ashby_response = AshbyApiResponse.model_validate(response_data)
+# or, straight from the raw bytes of a saved file:
+# ashby_response = AshbyApiResponse.model_validate_json(path.read_bytes())
 # print(f"Found {len(ashby_response.jobs)} jobs")
 # for job in ashby_response.jobs:
 #     print(f"- {job.title} at {job.location}")
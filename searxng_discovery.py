@@ -15,6 +15,7 @@ Requirements:
 - SEARXNG_URL in .env pointing to your instance
 """
 
+import csv
 import requests
 import pandas as pd
 import re
@@ -340,15 +341,21 @@ def create_temp_copy(source_path: str) -> str | None:
         return None
 
 
-def write_dataframe_atomically(df: pd.DataFrame, target_path: str) -> None:
-    """Write DataFrame to CSV via temp file and atomically replace the original."""
+def write_rows_atomically(
+    header: List[str], rows: List[List[str]], target_path: str
+) -> None:
+    """Write CSV rows via temp file and atomically replace the original."""
     target_dir = os.path.dirname(target_path) or "."
     os.makedirs(target_dir, exist_ok=True)
 
     fd, temp_path = tempfile.mkstemp(prefix=".tmp_", suffix=".csv", dir=target_dir)
     try:
-        with os.fdopen(fd, "w", encoding="utf-8", newline="") as tmp_file:
-            df.to_csv(tmp_file, index=False)
+        with os.fdopen(
+            fd, "w", encoding="utf-8", newline="", buffering=1 << 20
+        ) as tmp_file:
+            writer = csv.writer(tmp_file)
+            writer.writerow(header)
+            writer.writerows(rows)
         os.replace(temp_path, target_path)
     except Exception:
         try:
@@ -443,9 +450,8 @@ def save_discovered_urls(
         try:
             df_existing = pd.read_csv(config["output_file"])
             if "url" in df_existing.columns and "name" in df_existing.columns:
-                for _, row in df_existing.iterrows():
-                    if pd.notna(row.get("url")):
-                        url = row["url"]
+                for url, name in zip(df_existing["url"], df_existing["name"]):
+                    if pd.notna(url):
                         # Standardize URL to match the format we'll use as keys
                         if platform_key == "rippling":
                             url = standardize_rippling_url(url)
@@ -453,23 +459,18 @@ def save_discovered_urls(
                             url = standardize_gem_url(url)
                         elif platform_key == "workday":
                             url = standardize_workday_url(url)
-                        existing_data[url] = row.get("name", "")
+                        existing_data[url] = name if pd.notna(name) else ""
         except Exception:
             pass
 
-    # Create DataFrame with name and url columns
-    rows = []
-    for url in sorted_urls:
-        # Use existing name if available, otherwise generate from URL
-        if url in existing_data and existing_data[url]:
-            name = existing_data[url]
-        else:
-            name = extract_company_name_from_url(url, platform_key)
-        rows.append({"name": name, "url": url})
-
-    df = pd.DataFrame(rows)
-    write_dataframe_atomically(df, config["output_file"])
-    print(f"  💾 Saved {len(df)} companies to {config['output_file']}")
+    # Build name,url rows, using the existing name if available, otherwise
+    # generating one from the URL
+    rows = [
+        [existing_data.get(url) or extract_company_name_from_url(url, platform_key), url]
+        for url in sorted_urls
+    ]
+    write_rows_atomically(["name", "url"], rows, config["output_file"])
+    print(f"  💾 Saved {len(rows)} companies to {config['output_file']}")
 
 
 def read_existing_urls(
@@ -850,13 +851,12 @@ def discover_platform(
             f"  Query total: +{len(new_from_query)} new URLs (cumulative: {len(discovered_norms)})"
         )
 
-        # Save progress after each query to preserve work if script is stopped
-        combined_urls = existing_urls.union(new_urls)
-        save_discovered_urls(combined_urls, platform_key, config)
-
-        # Update existing_urls to include newly discovered URLs for next iteration
+        # Fold newly discovered URLs into existing_urls in place for the next iteration
         # This ensures we don't duplicate work and the save reflects current state
-        existing_urls = combined_urls.copy()
+        existing_urls |= new_urls
+
+        # Save progress after each query to preserve work if script is stopped
+        save_discovered_urls(existing_urls, platform_key, config)
 
         # Delay between queries to avoid rate limiting
         if strategy_idx < len(strategies_to_use) and query_cooldown > 0:
@@ -869,9 +869,6 @@ def discover_platform(
     print(f"  🔍 Companies found: {len(discovered_norms)}")
     print(f"  🆕 New companies: {new_count}")
 
-    # Final save (data is already saved after each query, but save once more to ensure consistency)
-    combined_urls = existing_urls.union(new_urls)
-
     if new_count:
         print("\n🎉 Sample of new URLs (first 10):")
         # Normalized URLs are already in standardized format (standardized before normalization)
@@ -881,10 +878,10 @@ def discover_platform(
         if new_count > 10:
             print(f"  ... and {new_count - 10} more")
 
-    # Final save using helper function
-    save_discovered_urls(combined_urls, platform_key, config)
+    # Final save (data is already saved after each query, but save once more to ensure consistency)
+    save_discovered_urls(existing_urls, platform_key, config)
     print(
-        f"\n✅ Final save complete: {len(combined_urls)} total companies saved to {config['output_file']}"
+        f"\n✅ Final save complete: {len(existing_urls)} total companies saved to {config['output_file']}"
     )
 
 
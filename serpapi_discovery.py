@@ -5,6 +5,8 @@ Finds more companies by using multiple search strategies beyond basic site: quer
 
 from serpapi import GoogleSearch
 import pandas as pd
+import csv
+import io
 import re
 import os
 from typing import Set, List, Tuple
@@ -276,18 +278,23 @@ def save_to_csv(
     column_name: str,
     platform: str = None,
 ):
-    """Save URLs to CSV with name and url columns, handling duplicates with existing data"""
+    """
+    Save URLs to CSV with name and url columns, handling duplicates with existing data.
+    existing_urls is updated in place to the combined set.
+    """
 
-    # Combine new and existing URLs
-    all_urls = existing_urls.union(urls)
+    # Combine new and existing URLs without copying the existing set
     new_urls = urls - existing_urls
+    existing_count = len(existing_urls)
+    existing_urls |= urls
+    all_urls = existing_urls
 
     print(f"\n📈 Results:")
     print(f"  🆕 New URLs found: {len(new_urls)}")
     print(f"  📊 Total unique URLs: {len(all_urls)}")
     print(
-        f"  📈 Growth: +{len(new_urls)} ({len(new_urls) / len(existing_urls) * 100:.1f}% increase)"
-        if existing_urls
+        f"  📈 Growth: +{len(new_urls)} ({len(new_urls) / existing_count * 100:.1f}% increase)"
+        if existing_count
         else ""
     )
 
@@ -311,19 +318,22 @@ def save_to_csv(
         except Exception:
             pass
 
-    # Create DataFrame with name and url columns
+    # Build name,url rows; use existing name if available, otherwise generate from URL
     rows = []
     for url in sorted(all_urls):
-        # Use existing name if available, otherwise generate from URL
-        if url in existing_data and existing_data[url]:
-            name = existing_data[url]
-        else:
+        name = existing_data.get(url)
+        if name is None or pd.isna(name) or name == "":
             name = extract_company_slug_from_url(url, platform or "")
-        rows.append({"name": name, "url": url})
-
-    df = pd.DataFrame(rows)
-    df.to_csv(output_file, index=False)
-    print(f"\n✅ Saved {len(df)} companies to {output_file}")
+        rows.append((name, url))
+
+    # Format the whole file in memory and write it in one call
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(("name", "url"))
+    writer.writerows(rows)
+    with open(output_file, "w", encoding="utf-8", newline="") as f:
+        f.write(buffer.getvalue())
+    print(f"\n✅ Saved {len(rows)} companies to {output_file}")
 
 
 def discover_platform(
@@ -238,10 +238,14 @@ def get_chrome_path() -> str:
         raise RuntimeError(f"Unsupported operating system: {system}")
 
 
+# Shared session so repeated CDP probes reuse one keep-alive connection
+_cdp_probe_session = http_requests.Session()
+
+
 def is_chrome_debuggable(port: int = 9222) -> bool:
     """Check if Chrome is running with remote debugging on the specified port."""
     try:
-        response = http_requests.get(f"http://localhost:{port}/json/version", timeout=2)
+        response = _cdp_probe_session.get(f"http://localhost:{port}/json/version", timeout=1)
         return response.status_code == 200
     except:
         return False
@@ -280,12 +284,14 @@ def launch_chrome_with_debugging(port: int = 9222, user_data_dir: Optional[str]
         stderr=subprocess.DEVNULL,
     )
 
-    # Wait for Chrome to start and be ready for debugging
-    for _ in range(30):  # Wait up to 15 seconds
+    # Wait up to 15 seconds for Chrome to start and be ready for debugging; each probe
+    # can take up to its 1s timeout, so bound the wait by time, not by attempts
+    deadline = time.monotonic() + 15
+    while time.monotonic() < deadline:
         if is_chrome_debuggable(port):
             logger.info("Chrome is ready for debugging")
             return process
-        time.sleep(0.5)
+        time.sleep(0.1)
 
     raise RuntimeError("Chrome failed to start with remote debugging")
 
@@ -15,10 +15,16 @@ MAX_RETRIES = 3
 BASE_RETRY_DELAY = 2  # seconds
 MIN_SCRAPE_DELAY = 1  # seconds
 MAX_SCRAPE_DELAY = 3  # seconds
+WORKABLE_BOARD_PREFIX = "https://apply.workable.com/"
 
 
 def extract_company_slug(url: str) -> str:
     """Extract company slug from Workable job board URL"""
+    # Board URLs are almost always https://apply.workable.com/<slug>; skip urlparse then
+    if url.startswith(WORKABLE_BOARD_PREFIX):
+        slug = url[len(WORKABLE_BOARD_PREFIX) :].partition("/")[0]
+        if slug and "?" not in slug and "#" not in slug:
+            return slug
     parsed = urlparse(url)
     # Extract the path and remove leading slash
     path = parsed.path.lstrip("/")